@@ -87,7 +87,11 @@ const state = {
     return saved === "wiki" ? "board" : (saved || "board");
   })(),
   lastVersion: null,
+  lastBoardVersions: {},
   pollInterval: null,
+  eventSource: null,
+  refreshTimer: null,
+  refreshPending: false,
 };
 
 const FILTERS_STORAGE_KEY = "mcd_board_filters_v1";
@@ -1539,7 +1543,14 @@ function renderColumns() {
       body.classList.remove("drag-target");
       const cardId = event.dataTransfer.getData("text/plain") || state.dragCardId;
       if (!cardId) return;
-      await api(`/api/cards/${cardId}/move`, "POST", { listId: list.id });
+      const payload = { listId: list.id };
+      const below = [...body.querySelectorAll(".card")].find((node) => {
+        if (node.dataset.cardId === cardId) return false;
+        const rect = node.getBoundingClientRect();
+        return event.clientY < rect.top + rect.height / 2;
+      });
+      if (below) payload.beforeCardId = below.dataset.cardId;
+      await api(`/api/cards/${cardId}/move`, "POST", payload);
       await refresh();
     });
 
@@ -1722,10 +1733,10 @@ async function refresh() {
     state.selectedChartId = "";
   }
 
-  try {
-    const vRes = await api("/api/state/version");
-    state.lastVersion = vRes.version;
-  } catch (e) { }
+  state.lastVersion = payload.state.stateVersion ?? null;
+  state.lastBoardVersions = Object.fromEntries(
+    (payload.state.boards || []).map((board) => [board.id, board.stateVersion || 0]),
+  );
 
   render();
 }
@@ -2116,6 +2127,18 @@ function registerEvents() {
   if (el.btnNewBoard) el.btnNewBoard.onclick = createNewBoard;
 }
 
+function hasRenderedChanges(vRes) {
+  // Only the active board and the board list are rendered; edits confined to
+  // other boards are picked up by the next full refresh.
+  const next = vRes.boards || {};
+  const prev = state.lastBoardVersions || {};
+  const nextIds = Object.keys(next);
+  if (nextIds.length !== Object.keys(prev).length || nextIds.some((id) => !(id in prev))) return true;
+  const activeId = state.data?.activeBoardId || "";
+  if ((vRes.activeBoardId || "") !== activeId) return true;
+  return next[activeId] !== prev[activeId];
+}
+
 function startPolling() {
   if (state.pollInterval) clearInterval(state.pollInterval);
   state.pollInterval = setInterval(async () => {
@@ -2124,7 +2147,7 @@ function startPolling() {
 
     try {
       const vRes = await api("/api/state/version");
-      if (vRes.ok && vRes.version && state.lastVersion && vRes.version !== state.lastVersion) {
+      if (vRes.ok && state.lastVersion !== null && vRes.version !== state.lastVersion && hasRenderedChanges(vRes)) {
         console.log("State mutation detected. Hot reloading...");
         await refresh();
       }
@@ -2134,6 +2157,69 @@ function startPolling() {
   }, 10000);
 }
 
+function changeTouchesView(change) {
+  if (change.type === "resync") return true;
+  if (change.type.startsWith("memory.")) return false;
+  if (change.type.startsWith("board.")) return true;
+  return !change.boardId || change.boardId === (state.data?.activeBoardId || "");
+}
+
+function scheduleRefresh() {
+  if (state.refreshTimer) return;
+  // Coalesce bursts (e.g. an agent creating several cards) into one reload.
+  state.refreshTimer = setTimeout(async () => {
+    state.refreshTimer = null;
+    if (document.visibilityState !== "visible") {
+      state.refreshPending = true;
+      return;
+    }
+    try {
+      await refresh();
+    } catch (e) {
+      // fail silently; the next change or poll retries
+    }
+  }, 150);
+}
+
+function startChangeStream() {
+  if (typeof EventSource === "undefined") {
+    startPolling();
+    return;
+  }
+  if (state.eventSource) state.eventSource.close();
+  const source = new EventSource("/api/events");
+  state.eventSource = source;
+
+  source.onopen = () => {
+    if (state.pollInterval) {
+      clearInterval(state.pollInterval);
+      state.pollInterval = null;
+    }
+  };
+  source.onmessage = (message) => {
+    let change;
+    try {
+      change = JSON.parse(message.data);
+    } catch (e) {
+      return;
+    }
+    // Our own writes already refreshed to this version.
+    if (change.type !== "resync" && change.version === state.lastVersion) return;
+    if (changeTouchesView(change)) scheduleRefresh();
+  };
+  source.onerror = () => {
+    // EventSource reconnects by itself; poll meanwhile so the board never goes stale.
+    if (!state.pollInterval) startPolling();
+  };
+
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "visible" && state.refreshPending) {
+      state.refreshPending = false;
+      scheduleRefresh();
+    }
+  });
+}
+
 async function toggleTheme() {
   const current = document.documentElement.getAttribute("data-theme") || "dark";
   const next = current === "dark" ? "light" : "dark";
@@ -2207,7 +2293,7 @@ async function bootstrap() {
   configureMermaidTheme();
   try {
     await refresh();
-    startPolling();
+    startChangeStream();
   } catch (error) {
     await showPrompt("alert", "Error", `Failed to load board: ${error.message}`);
   }
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Shared helpers for Command Deck benchmarks.
+
+Builds a throwaway workspace with the same layout the extension scaffolds
+(``<workspace>/.amphion/command-deck``), imports that copy of ``server.py``
+and serves it in-process so benchmarks exercise the real HTTP handlers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import shutil
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DECK_SOURCE = REPO_ROOT / "assets" / "launch-command-deck"
+
+
+def build_workspace(root: Path, *, project_name: str = "Bench", codename: str = "BEN") -> Path:
+    """Copy the deck runtime into ``root`` and initialize a seeded database."""
+    deck_dir = root / ".amphion" / "command-deck"
+    if deck_dir.exists():
+        shutil.rmtree(deck_dir)
+    deck_dir.mkdir(parents=True)
+    shutil.copy2(DECK_SOURCE / "server.py", deck_dir / "server.py")
+    shutil.copytree(DECK_SOURCE / "public", deck_dir / "public")
+    shutil.copytree(DECK_SOURCE / "scripts", deck_dir / "scripts")
+
+    init_module = _load_module("bench_init_command_deck", deck_dir / "scripts" / "init_command_deck.py")
+    db_path = deck_dir / "data" / "amphion.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    init_module.init_db(
+        db_path=db_path,
+        project_name=project_name,
+        codename=codename,
+        initial_version="v0.01a",
+        milestone_title="Version 0a Pre-Release",
+        seed_template="scaffold",
+    )
+    return deck_dir
+
+
+def load_server(deck_dir: Path) -> ModuleType:
+    """Import the workspace copy of server.py (runs its startup migrations)."""
+    return _load_module(f"bench_deck_server_{id(deck_dir)}", deck_dir / "server.py")
+
+
+def _load_module(name: str, path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class DeckServer:
+    """Run ``KanbanHandler`` on an ephemeral port in a background thread.
+
+    ``mode="asyncio"`` serves it through ``AsyncDeckServer`` (``--server asyncio``)
+    instead of ``ThreadingHTTPServer``.
+    """
+
+    def __init__(self, module: ModuleType, host: str = "127.0.0.1", mode: str = "threading"):
+        class QuietHandler(module.KanbanHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        self.module = module
+        self.mode = mode
+        self._ready = threading.Event()
+        if mode == "asyncio":
+            self.httpd = None
+            self.async_server = module.AsyncDeckServer(host, 0, handler_class=QuietHandler)
+            self._thread = threading.Thread(target=self._run_async, daemon=True)
+        else:
+            self.httpd = ThreadingHTTPServer((host, 0), QuietHandler)
+            self.async_server = None
+            self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.host = host
+        self.base_url = ""
+
+    def _run_async(self) -> None:
+        asyncio.run(self.async_server.serve(on_ready=lambda port: self._ready.set()))
+
+    def __enter__(self) -> "DeckServer":
+        self._thread.start()
+        if self.httpd is not None:
+            port = self.httpd.server_address[1]
+        else:
+            if not self._ready.wait(10):
+                raise RuntimeError("asyncio server did not start")
+            port = self.async_server.port
+        self.base_url = f"http://{self.host}:{port}"
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        else:
+            self.async_server.shutdown()
+            self._thread.join(10)
+        self.module.STORE.close()
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"} if data else {},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return resp.status, json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as exc:
+            raw = exc.read()
+            return exc.code, json.loads(raw.decode("utf-8")) if raw else {}
+
+
+def run_concurrent(
+    call: Callable[[], Any],
+    *,
+    threads: int,
+    duration: float,
+) -> Dict[str, Any]:
+    """Invoke ``call`` from ``threads`` workers for ``duration`` seconds."""
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    errors = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(slot: int) -> None:
+        barrier.wait()
+        stop_at = time.perf_counter() + duration
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                call()
+            except Exception:
+                errors[slot] += 1
+                continue
+            latencies[slot].append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    started = time.perf_counter()
+    barrier.wait()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(value for bucket in latencies for value in bucket)
+    return {
+        "threads": threads,
+        "requests": len(samples),
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        **latency_summary(samples),
+    }
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50Ms": 0.0, "p95Ms": 0.0, "p99Ms": 0.0, "meanMs": 0.0}
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "p50Ms": pct(0.50),
+        "p95Ms": pct(0.95),
+        "p99Ms": pct(0.99),
+        "meanMs": round(statistics.fmean(ordered) * 1000, 3),
+    }
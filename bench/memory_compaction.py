@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Compare set-based memory compaction with the previous row-at-a-time loop.
+
+Seeds one board with ``--events`` memory events and ``--objects`` memory
+objects, then compacts identical copies of the database with the current
+``_compact_memory`` and with ``legacy_compact`` (the pre-window-function
+implementation, kept here as the baseline). Both must remove the same rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from deck_harness import build_workspace, load_server
+
+
+def seed_memory(module: Any, events: int, objects: int) -> str:
+    """Insert synthetic events/objects with increasing timestamps; returns the board id."""
+    with module.STORE.writer() as conn:
+        c = conn.cursor()
+        c.execute("SELECT value FROM meta WHERE key='activeBoardId'")
+        board_id = c.fetchone()["value"]
+        base = time.time() - events
+
+        def stamp(offset: int) -> str:
+            return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base + offset))
+
+        event_rows = []
+        for index in range(events):
+            key = f"bench.{index % max(objects, 1)}"
+            value = json.dumps({"n": index, "note": "synthetic compaction payload"})
+            row = {"memoryKey": key, "value": value, "tags": '["bench"]', "sourceRef": f"bench:{index}"}
+            event_rows.append(
+                (
+                    f"mev_{index:08d}", board_id, key, "upsert", "operator", 1, "misc",
+                    value, row["tags"], None, row["sourceRef"], stamp(index),
+                    module._memory_event_payload_bytes(row),
+                )
+            )
+        c.executemany(
+            """
+            INSERT INTO memory_events (
+                id, boardId, memoryKey, eventType, sourceType, attested, bucket,
+                value, tags, ttlSeconds, sourceRef, createdAt, payloadBytes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            event_rows,
+        )
+
+        object_rows = []
+        for index in range(objects):
+            key = f"bench.{index}"
+            value = json.dumps({"n": index, "note": "synthetic compaction payload"})
+            row = {"memoryKey": key, "value": value, "tags": '["bench"]'}
+            object_rows.append(
+                (
+                    f"memobj_{index:08d}", board_id, key, value, row["tags"], stamp(index),
+                    module._memory_object_payload_bytes(row),
+                )
+            )
+        c.executemany(
+            """
+            INSERT INTO memory_objects (
+                id, boardId, memoryKey, bucket, value, tags, sourceType, isDeleted,
+                version, lastEventId, createdAt, updatedAt, lastTouchedAt, expiresAt, payloadBytes
+            ) VALUES (?, ?, ?, 'misc', ?, ?, 'operator', 0, 1, '', ?6, ?6, ?6, '', ?7)
+            """,
+            object_rows,
+        )
+        conn.commit()
+    return board_id
+
+
+def legacy_compact(cursor: sqlite3.Cursor, board_id: str, budgets: Any) -> Dict[str, int]:
+    """The previous compaction: LENGTH() scans plus one DELETE per pruned row."""
+
+    def object_bytes() -> int:
+        cursor.execute(
+            """
+            SELECT COALESCE(SUM(LENGTH(memoryKey) + LENGTH(COALESCE(value,'')) + LENGTH(COALESCE(tags,''))), 0) AS n
+            FROM memory_objects WHERE boardId=? AND isDeleted=0
+            """,
+            (board_id,),
+        )
+        return int(cursor.fetchone()["n"])
+
+    def event_bytes() -> int:
+        cursor.execute(
+            """
+            SELECT COALESCE(SUM(LENGTH(memoryKey) + LENGTH(COALESCE(value,'')) + LENGTH(COALESCE(tags,''))
+                + LENGTH(COALESCE(sourceRef,''))), 0) AS n
+            FROM memory_events WHERE boardId=?
+            """,
+            (board_id,),
+        )
+        return int(cursor.fetchone()["n"])
+
+    removed = {"overflowObjects": 0, "objectBytesPruned": 0, "overflowEvents": 0, "eventBytesPruned": 0}
+    object_bytes(), event_bytes()  # stats_before
+
+    cursor.execute(
+        "SELECT id FROM memory_objects WHERE boardId=? AND isDeleted=0 ORDER BY updatedAt DESC, memoryKey ASC, id DESC",
+        (board_id,),
+    )
+    ids = [row["id"] for row in cursor.fetchall()]
+    if len(ids) > budgets.max_objects:
+        drop = ids[budgets.max_objects :]
+        cursor.executemany("DELETE FROM memory_objects WHERE id=?", [(value,) for value in drop])
+        removed["overflowObjects"] = len(drop)
+
+    total = object_bytes()
+    while total > budgets.max_object_bytes:
+        cursor.execute(
+            """
+            SELECT id, memoryKey, value, tags FROM memory_objects
+            WHERE boardId=? AND isDeleted=0 ORDER BY updatedAt ASC, memoryKey ASC, id ASC LIMIT 1
+            """,
+            (board_id,),
+        )
+        oldest = cursor.fetchone()
+        if not oldest:
+            break
+        total -= len(oldest["memoryKey"] or "") + len(oldest["value"] or "") + len(oldest["tags"] or "")
+        cursor.execute("DELETE FROM memory_objects WHERE id=?", (oldest["id"],))
+        removed["objectBytesPruned"] += 1
+
+    cursor.execute("SELECT id FROM memory_events WHERE boardId=? ORDER BY createdAt DESC, id DESC", (board_id,))
+    ids = [row["id"] for row in cursor.fetchall()]
+    if len(ids) > budgets.max_events:
+        drop = ids[budgets.max_events :]
+        cursor.executemany("DELETE FROM memory_events WHERE id=?", [(value,) for value in drop])
+        removed["overflowEvents"] = len(drop)
+
+    total = event_bytes()
+    while total > budgets.max_event_bytes:
+        cursor.execute(
+            """
+            SELECT id, memoryKey, value, tags, sourceRef FROM memory_events
+            WHERE boardId=? ORDER BY createdAt ASC, id ASC LIMIT 1
+            """,
+            (board_id,),
+        )
+        oldest = cursor.fetchone()
+        if not oldest:
+            break
+        total -= sum(len(oldest[key] or "") for key in ("memoryKey", "value", "tags", "sourceRef"))
+        cursor.execute("DELETE FROM memory_events WHERE id=?", (oldest["id"],))
+        removed["eventBytesPruned"] += 1
+
+    object_bytes(), event_bytes()  # stats_after
+    return removed
+
+
+def run_copy(module: Any, source: Path, target: Path, board_id: str, budgets: Any, legacy: bool) -> Dict[str, Any]:
+    shutil.copy2(source, target)
+    conn = sqlite3.connect(target)
+    conn.row_factory = module.dict_factory
+    try:
+        c = conn.cursor()
+        started = time.perf_counter()
+        if legacy:
+            removed = legacy_compact(c, board_id, budgets)
+        else:
+            removed = module._compact_memory(c, board_id, module.now_iso(), budgets)["removed"]
+        conn.commit()
+        seconds = time.perf_counter() - started
+        c.execute("SELECT COUNT(*) AS n FROM memory_events")
+        events_left = c.fetchone()["n"]
+        c.execute("SELECT COUNT(*) AS n FROM memory_objects")
+        objects_left = c.fetchone()["n"]
+    finally:
+        conn.close()
+    return {
+        "implementation": "legacy" if legacy else "set-based",
+        "seconds": round(seconds, 4),
+        "removed": {key: removed.get(key, 0) for key in ("overflowObjects", "objectBytesPruned", "overflowEvents", "eventBytesPruned")},
+        "eventsLeft": events_left,
+        "objectsLeft": objects_left,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memory compaction.")
+    parser.add_argument("--events", type=int, default=100_000, help="Memory events to seed")
+    parser.add_argument("--objects", type=int, default=5_000, help="Memory objects to seed")
+    parser.add_argument("--max-events", type=int, default=20_000, help="Event count budget")
+    parser.add_argument("--max-event-bytes", type=int, default=32_768, help="Event byte budget")
+    parser.add_argument("--max-objects", type=int, default=2_000, help="Object count budget")
+    parser.add_argument("--max-object-bytes", type=int, default=16_384, help="Object byte budget")
+    parser.add_argument("--output", default="", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as tmp:
+        deck_dir = build_workspace(Path(tmp))
+        module = load_server(deck_dir)
+        board_id = seed_memory(module, args.events, args.objects)
+        module.STORE.close()
+        source = deck_dir / "data" / "amphion.db"
+        budgets = module.MemoryBudgets(
+            max_objects=args.max_objects,
+            max_events=args.max_events,
+            max_object_bytes=args.max_object_bytes,
+            max_event_bytes=args.max_event_bytes,
+        )
+
+        results: List[Dict[str, Any]] = []
+        for legacy in (True, False):
+            result = run_copy(module, source, Path(tmp) / f"compact-{int(legacy)}.db", board_id, budgets, legacy)
+            results.append(result)
+            print(
+                f"{result['implementation']:<10} {result['seconds']:>8.3f}s  removed={result['removed']}  "
+                f"left: events={result['eventsLeft']} objects={result['objectsLeft']}"
+            )
+
+    if results[0]["removed"] != results[1]["removed"]:
+        print("Implementations disagree on removed rows")
+        return 1
+    speedup = results[0]["seconds"] / results[1]["seconds"] if results[1]["seconds"] else 0.0
+    print(f"speed-up: {speedup:.1f}x")
+
+    report = {
+        "benchmark": "memory_compaction",
+        "events": args.events,
+        "objects": args.objects,
+        "budgets": {
+            "maxEvents": args.max_events,
+            "maxEventBytes": args.max_event_bytes,
+            "maxObjects": args.max_objects,
+            "maxObjectBytes": args.max_object_bytes,
+        },
+        "speedup": round(speedup, 2),
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
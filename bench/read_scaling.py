@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Measure Command Deck read throughput as client concurrency grows.
+
+Reads run on pooled WAL reader connections without the store lock, so
+throughput should hold or rise with thread count, including while a writer
+is active (``--with-writer``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from deck_harness import DeckServer, build_workspace, load_server, run_concurrent
+
+
+def seed_cards(module: Any, count: int) -> str:
+    """Insert ``count`` cards and memory objects directly; returns the board id."""
+    with module.STORE.writer() as conn:
+        c = conn.cursor()
+        c.execute("SELECT value FROM meta WHERE key='activeBoardId'")
+        board_id = c.fetchone()["value"]
+        c.execute("SELECT id FROM lists WHERE boardId=? ORDER BY listOrder", (board_id,))
+        list_ids = [row["id"] for row in c.fetchall()]
+        c.execute("SELECT id FROM milestones WHERE boardId=? ORDER BY msOrder", (board_id,))
+        milestone_id = c.fetchone()["id"]
+        now = module.now_iso()
+        c.executemany(
+            """
+            INSERT INTO cards (
+                id, boardId, issueNumber, title, description, acceptance, milestoneId, listId,
+                priority, owner, targetDate, kind, cardOrder, createdAt, updatedAt
+            ) VALUES (?, ?, ?, ?, ?, '', ?, ?, 'P2', '', '', 'task', ?, ?, ?)
+            """,
+            [
+                (
+                    module.new_id("card"),
+                    board_id,
+                    f"BEN-{index + 1000:05d}",
+                    f"Synthetic card {index}",
+                    f"Benchmark description {index}",
+                    milestone_id,
+                    list_ids[index % len(list_ids)],
+                    index,
+                    now,
+                    now,
+                )
+                for index in range(count)
+            ],
+        )
+        c.executemany(
+            """
+            INSERT INTO memory_objects (
+                id, boardId, memoryKey, bucket, value, tags, sourceType, isDeleted,
+                version, lastEventId, createdAt, updatedAt, lastTouchedAt, expiresAt
+            ) VALUES (?, ?, ?, 'misc', ?, '["bench"]', 'operator', 0, 1, '', ?, ?, ?, '')
+            """,
+            [
+                (module.new_id("memobj"), board_id, f"bench.{index}", json.dumps({"n": index}), now, now, now)
+                for index in range(min(count, 2000))
+            ],
+        )
+        conn.commit()
+    return board_id
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark read scaling across client threads.")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated thread counts")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per measurement")
+    parser.add_argument("--cards", type=int, default=1000, help="Synthetic cards to seed")
+    parser.add_argument(
+        "--routes",
+        default="/api/find,/api/state,/api/memory/query?q=bench",
+        help="Comma-separated GET routes to measure",
+    )
+    parser.add_argument("--with-writer", action="store_true", help="Run a concurrent memory writer")
+    parser.add_argument("--output", default="", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    thread_counts = [int(value) for value in args.threads.split(",") if value.strip()]
+    routes = [value.strip() for value in args.routes.split(",") if value.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as tmp:
+        deck_dir = build_workspace(Path(tmp))
+        module = load_server(deck_dir)
+        seed_cards(module, args.cards)
+
+        results: List[Dict[str, Any]] = []
+        with DeckServer(module) as server:
+            stop_writer = threading.Event()
+            writes = [0]
+
+            def writer_loop() -> None:
+                while not stop_writer.is_set():
+                    server.request(
+                        "POST",
+                        "/api/memory/events",
+                        {"memoryKey": f"writer.{writes[0] % 50}", "value": {"n": writes[0]}, "sourceType": "operator"},
+                    )
+                    writes[0] += 1
+
+            writer = threading.Thread(target=writer_loop, daemon=True)
+            if args.with_writer:
+                writer.start()
+            try:
+                for route in routes:
+                    for threads in thread_counts:
+                        stats = run_concurrent(
+                            lambda route=route: server.request("GET", route),
+                            threads=threads,
+                            duration=args.duration,
+                        )
+                        stats["route"] = route
+                        results.append(stats)
+                        print(
+                            f"{route:<32} threads={threads:<3} rps={stats['rps']:<8} "
+                            f"p50={stats['p50Ms']}ms p95={stats['p95Ms']}ms errors={stats['errors']}"
+                        )
+            finally:
+                stop_writer.set()
+                if args.with_writer:
+                    writer.join()
+
+    report = {
+        "benchmark": "read_scaling",
+        "cards": args.cards,
+        "withWriter": args.with_writer,
+        "writerRequests": writes[0],
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Measure per-route dispatch cost of the precompiled ``RouteTable``.
+
+Resolves one concrete path for every registered route with ``ROUTES.match``
+and with ``legacy_dispatch`` (the previous ``if route == ...`` /
+``startswith`` chain inside ``do_GET``/``do_POST``/..., kept here as the
+baseline). Both must pick the same handler for every path. Lookups do not
+touch the database, so this isolates routing from handler work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from deck_harness import build_workspace, load_server
+
+SAMPLE_PARAMS = {
+    "boardId": "board_0123456789",
+    "milestoneId": "ms_0123456789",
+    "artifactId": "art_0123456789",
+    "cardId": "card_0123456789",
+    "listId": "list_0123456789",
+    "chartId": "chart_0123456789",
+    "docId": "charter",
+}
+
+
+def legacy_dispatch(method: str, route: str) -> Optional[str]:
+    """The previous if-chains, in their original order, returning the handler name."""
+    if method == "GET":
+        if route == "/api/health":
+            return "_get_health"
+        if route == "/api/conventions":
+            return "_get_conventions"
+        if route == "/api/find":
+            return "_get_find"
+        if route == "/api/state":
+            return "_get_state"
+        if route == "/api/events":
+            return "_get_events"
+        if route == "/api/state/changes":
+            return "_get_state_changes"
+        if route == "/api/state/version":
+            return "_get_state_version"
+        if route == "/api/migration/legacy-state-json/status":
+            return "_get_legacy_migration_status"
+        if route.startswith("/api/boards/") and "/artifacts" in route:
+            parts = route.split("/")
+            if len(parts) >= 5 and parts[4] == "artifacts":
+                return "_get_board_artifacts"
+        if route.startswith("/api/milestones/") and "/artifacts" in route:
+            parts = route.split("/")
+            if len(parts) >= 5 and parts[4] == "artifacts":
+                return "_get_milestone_artifacts"
+        if route == "/api/memory/state":
+            return "_get_memory_state"
+        if route == "/api/memory/query":
+            return "_get_memory_query"
+        if route.startswith("/api/docs/"):
+            return "_get_doc"
+        if route == "/api/git/log":
+            return "_get_git_log"
+        return None
+
+    if method == "POST":
+        if route == "/api/memory/events":
+            return "_post_memory_event"
+        if route == "/api/memory/events:batch":
+            return "_post_memory_event_batch"
+        if route == "/api/memory/compact":
+            return "_post_memory_compact"
+        if route == "/api/memory/export":
+            return "_post_memory_export"
+        if route == "/api/migration/legacy-state-json/run":
+            return "_post_legacy_migration_run"
+        if route.startswith("/api/boards/") and route.endswith("/artifacts"):
+            return "_post_board_artifact" if len(route.split("/")) == 5 else None
+        if route.startswith("/api/milestones/"):
+            parts = route.split("/")
+            if len(parts) == 5 and parts[4] == "artifacts":
+                return "_post_milestone_artifact"
+        if route == "/api/boards":
+            return "_post_board"
+        if route.endswith("/activate") and route.startswith("/api/boards/"):
+            return "_post_board_activate"
+        if route == "/api/lists":
+            return "_post_list"
+        if route == "/api/milestones":
+            return "_post_milestone"
+        if route.endswith("/restore") and route.startswith("/api/milestones/"):
+            return "_post_milestone_restore"
+        if route == "/api/cards:batch":
+            return "_post_card_batch"
+        if route == "/api/cards":
+            return "_post_card"
+        if route == "/api/charts":
+            return "_post_chart"
+        if (route.endswith("/move") or route.endswith("/reorder")) and route.startswith("/api/cards/"):
+            return "_post_card_reorder" if route.endswith("/reorder") else "_post_card_move"
+        if route == "/api/boards/import" or route.endswith("/clone"):
+            return "_post_not_implemented"
+        if route == "/api/reload":
+            return "_post_reload"
+        return None
+
+    if method == "PATCH":
+        if route.startswith("/api/milestones/") and "/artifacts" in route:
+            parts = route.split("/")
+            if len(parts) >= 5 and parts[4] == "artifacts":
+                return "_patch_milestone_artifact"
+        if route.startswith("/api/boards/"):
+            return "_patch_board"
+        if route.startswith("/api/lists/"):
+            return "_patch_list"
+        if route.startswith("/api/milestones/"):
+            return "_patch_milestone" if len(route.split("/")) == 4 else None
+        if route.startswith("/api/cards/"):
+            return "_patch_card"
+        if route.startswith("/api/charts/"):
+            return "_patch_chart"
+        return None
+
+    if method == "DELETE":
+        if route.startswith("/api/boards/"):
+            return "_delete_board"
+        if route.startswith("/api/lists/"):
+            return "_delete_list"
+        if route.startswith("/api/milestones/"):
+            parts = route.split("/")
+            if len(parts) >= 5 and parts[4] == "artifacts":
+                return "_delete_milestone_artifact"
+            return "_delete_milestone" if len(parts) == 4 else None
+        if route.startswith("/api/cards/"):
+            return "_delete_card"
+        if route.startswith("/api/charts/"):
+            return "_delete_chart"
+    return None
+
+
+def sample_path(template: str) -> str:
+    return template.format(**SAMPLE_PARAMS)
+
+
+def time_lookup(call: Any, repeat: int, number: int) -> float:
+    """Best-of-``repeat`` nanoseconds per call."""
+    return min(timeit.repeat(call, repeat=repeat, number=number)) / number * 1e9
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark KanbanHandler route dispatch.")
+    parser.add_argument("--number", type=int, default=20_000, help="Lookups per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per route (best is kept)")
+    parser.add_argument("--output", default="", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as tmp:
+        module = load_server(build_workspace(Path(tmp)))
+        routes = module.ROUTES
+        module.STORE.close()
+
+    results: List[Dict[str, Any]] = []
+    mismatches = 0
+    for method, template in routes.routes:
+        path = sample_path(template)
+        found = routes.match(method, path)
+        handler = found[0].__name__ if found else None
+        legacy = legacy_dispatch(method, path)
+        if handler != legacy:
+            mismatches += 1
+            print(f"MISMATCH {method} {path}: table={handler} legacy={legacy}")
+
+        table_ns = time_lookup(lambda: routes.match(method, path), args.repeat, args.number)
+        legacy_ns = time_lookup(lambda: legacy_dispatch(method, path), args.repeat, args.number)
+        results.append(
+            {
+                "method": method,
+                "route": template,
+                "handler": handler,
+                "tableNs": round(table_ns, 1),
+                "legacyNs": round(legacy_ns, 1),
+            }
+        )
+        print(f"{method:<6} {template:<56} table={table_ns:>7.0f}ns  legacy={legacy_ns:>7.0f}ns")
+
+    table_mean = sum(row["tableNs"] for row in results) / len(results)
+    legacy_mean = sum(row["legacyNs"] for row in results) / len(results)
+    table_worst = max(row["tableNs"] for row in results)
+    legacy_worst = max(row["legacyNs"] for row in results)
+    print(f"mean:  table={table_mean:.0f}ns  legacy={legacy_mean:.0f}ns")
+    print(f"worst: table={table_worst:.0f}ns  legacy={legacy_worst:.0f}ns")
+
+    if args.output:
+        report = {
+            "benchmark": "route_dispatch",
+            "routes": len(results),
+            "mismatches": mismatches,
+            "meanNs": {"table": round(table_mean, 1), "legacy": round(legacy_mean, 1)},
+            "worstNs": {"table": table_worst, "legacy": legacy_worst},
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""End-to-end Command Deck benchmark suite on a synthetic large board.
+
+Seeds a board with ``synthetic.seed_board`` and drives the real HTTP API
+through ``DeckServer`` at each requested client concurrency, reporting
+throughput and latency per scenario: board reads (``/api/state``,
+``/api/find``), card create and move, memory write and query, and memory
+compaction. Non-2xx responses count as errors. The JSON report carries the
+board shape and the settings so runs can be compared side by side.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from deck_harness import DeckServer, build_workspace, load_server, run_concurrent
+from synthetic import WORDS, BoardShape, SeededBoard, seed_board
+
+SCENARIOS = ("state", "find", "card-create", "card-move", "memory-write", "memory-query", "memory-compact")
+
+
+class RequestFailed(RuntimeError):
+    pass
+
+
+def scenario_calls(server: DeckServer, board: SeededBoard) -> Dict[str, Callable[[], Any]]:
+    """One zero-argument request per scenario; each raises on a non-2xx response."""
+    card_milestones = board.milestone_ids[1:] or board.milestone_ids
+    counter = [0]
+
+    def call(method: str, path: str, body: Any = None) -> Any:
+        status, payload = server.request(method, path, body)
+        if status >= 300:
+            raise RequestFailed(f"{method} {path} -> {status}: {payload.get('error', '')}")
+        return payload
+
+    def card_create() -> Any:
+        counter[0] += 1
+        return call(
+            "POST",
+            "/api/cards",
+            {
+                "boardId": board.board_id,
+                "listId": random.choice(board.list_ids),
+                "milestoneId": random.choice(card_milestones),
+                "title": f"Bench card {counter[0]}",
+                "description": "Created by bench/suite.py",
+            },
+        )
+
+    def memory_write() -> Any:
+        counter[0] += 1
+        return call(
+            "POST",
+            "/api/memory/events",
+            {
+                "boardId": board.board_id,
+                "memoryKey": random.choice(board.memory_keys),
+                "value": {"n": counter[0], "note": "bench suite write"},
+                "tags": ["bench", f"t{counter[0] % 8}"],
+                "sourceType": "operator",
+            },
+        )
+
+    return {
+        "state": lambda: call("GET", "/api/state"),
+        "find": lambda: call("GET", f"/api/find?q={random.choice(WORDS)}"),
+        "card-create": card_create,
+        "card-move": lambda: call(
+            "POST", f"/api/cards/{random.choice(board.card_ids)}/move", {"listId": random.choice(board.list_ids)}
+        ),
+        "memory-write": memory_write,
+        "memory-query": lambda: call(
+            "GET", f"/api/memory/query?q={random.choice(WORDS)}&tag=t{random.randrange(8)}&limit=50"
+        ),
+        "memory-compact": lambda: call("POST", "/api/memory/compact", {"boardId": board.board_id}),
+    }
+
+
+def table_counts(db_path: Path) -> Dict[str, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("lists", "milestones", "cards", "charts", "milestone_artifacts", "memory_events", "memory_objects")
+        }
+    finally:
+        conn.close()
+
+
+def compare(baseline: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+    """Print rps and p95 changes against a previous report, matched on scenario and threads."""
+    previous = {(row["scenario"], row["threads"]): row for row in baseline.get("results", [])}
+    for row in results:
+        before = previous.get((row["scenario"], row["threads"]))
+        if not before or not before["rps"]:
+            continue
+        rps_delta = (row["rps"] - before["rps"]) / before["rps"] * 100
+        print(
+            f"{row['scenario']:<15} threads={row['threads']:<3} rps {before['rps']} -> {row['rps']} ({rps_delta:+.1f}%)  "
+            f"p95 {before['p95Ms']}ms -> {row['p95Ms']}ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the Command Deck benchmark suite on a synthetic board.")
+    BoardShape.add_arguments(parser)
+    parser.add_argument("--threads", default="1,4,8", help="Comma-separated client thread counts")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per scenario and thread count")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--server", choices=("threading", "asyncio"), default="threading", help="HTTP front end to serve")
+    parser.add_argument("--output", default="", help="Write JSON results to this path")
+    parser.add_argument("--baseline", default="", help="Earlier --output report to print deltas against")
+    args = parser.parse_args()
+
+    shape = BoardShape.from_args(args)
+    thread_counts = [int(value) for value in args.threads.split(",") if value.strip()]
+    scenarios = [value.strip() for value in args.scenarios.split(",") if value.strip()]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    random.seed(shape.seed)
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as tmp:
+        deck_dir = build_workspace(Path(tmp))
+        module = load_server(deck_dir)
+        board = seed_board(module, shape)
+        seeded = table_counts(deck_dir / "data" / "amphion.db")
+        print(f"seeded {seeded} in {board.seconds}s")
+
+        results: List[Dict[str, Any]] = []
+        compaction: Dict[str, Any] = {}
+        with DeckServer(module, mode=args.server) as server:
+            calls = scenario_calls(server, board)
+            for scenario in scenarios:
+                if scenario == "memory-compact":
+                    # The first pass does the pruning; later passes measure
+                    # the steady state where budgets are already met.
+                    started = time.perf_counter()
+                    payload = calls[scenario]()
+                    compaction = {
+                        "firstPassMs": round((time.perf_counter() - started) * 1000, 3),
+                        "removed": payload["memory"]["compact"].get("removed", {}),
+                    }
+                    print(f"{scenario:<15} first pass {compaction['firstPassMs']}ms removed={compaction['removed']}")
+                for threads in thread_counts:
+                    stats = run_concurrent(calls[scenario], threads=threads, duration=args.duration)
+                    stats["scenario"] = scenario
+                    results.append(stats)
+                    print(
+                        f"{scenario:<15} threads={threads:<3} rps={stats['rps']:<8} "
+                        f"p50={stats['p50Ms']}ms p95={stats['p95Ms']}ms p99={stats['p99Ms']}ms errors={stats['errors']}"
+                    )
+
+    errors = sum(row["errors"] for row in results)
+    report = {
+        "benchmark": "suite",
+        "startedAt": started_at,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "server": args.server,
+        "shape": shape.to_json(),
+        "seeded": seeded,
+        "seedSeconds": board.seconds,
+        "duration": args.duration,
+        "errors": errors,
+        "compaction": compaction,
+        "results": results,
+    }
+    if args.baseline:
+        compare(json.loads(Path(args.baseline).read_text(encoding="utf-8")), results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Synthetic large-board generator for Command Deck benchmarks.
+
+Grows the active board of a freshly initialized workspace (see
+``deck_harness.build_workspace``) to a requested shape with bulk inserts on
+the server's own writer connection, so the usual triggers (search index,
+change tracking) fire exactly as they would for API writes. Counts are
+totals: rows the scaffold already created count towards them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from deck_harness import build_workspace, load_server
+
+CHART_MARKDOWN = "```mermaid\nflowchart TD\n  Plan --> Build\n  Build --> Review\n  Review --> Ship\n```"
+MILESTONE_ARTIFACT_TYPES = ("findings", "outcomes")
+PRIORITIES = ("P0", "P1", "P2", "P3")
+MEMORY_BUCKETS = ("misc", "dec", "ct", "ref")
+WORDS = (
+    "deck", "board", "card", "sprint", "latency", "schema", "index", "cache", "bridge",
+    "release", "review", "ticket", "memory", "budget", "query", "render", "router", "writer",
+)
+
+
+@dataclass
+class BoardShape:
+    """Target row counts for the synthetic board."""
+
+    lists: int = 5
+    milestones: int = 10
+    cards: int = 5_000
+    charts: int = 20
+    artifacts: int = 40
+    memory_events: int = 20_000
+    memory_keys: int = 1_000
+    seed: int = 7
+
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        defaults = cls()
+        parser.add_argument("--lists", type=int, default=defaults.lists, help="Lists on the board")
+        parser.add_argument("--milestones", type=int, default=defaults.milestones, help="Milestones on the board")
+        parser.add_argument("--cards", type=int, default=defaults.cards, help="Cards on the board")
+        parser.add_argument("--charts", type=int, default=defaults.charts, help="Charts on the board")
+        parser.add_argument("--artifacts", type=int, default=defaults.artifacts, help="Milestone artifact revisions")
+        parser.add_argument("--memory-events", type=int, default=defaults.memory_events, help="Memory events")
+        parser.add_argument("--memory-keys", type=int, default=defaults.memory_keys, help="Distinct memory keys (objects)")
+        parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed for synthetic text")
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "BoardShape":
+        return cls(
+            lists=args.lists,
+            milestones=args.milestones,
+            cards=args.cards,
+            charts=args.charts,
+            artifacts=args.artifacts,
+            memory_events=args.memory_events,
+            memory_keys=args.memory_keys,
+            seed=args.seed,
+        )
+
+    def to_json(self) -> Dict[str, int]:
+        return {
+            "lists": self.lists,
+            "milestones": self.milestones,
+            "cards": self.cards,
+            "charts": self.charts,
+            "artifacts": self.artifacts,
+            "memoryEvents": self.memory_events,
+            "memoryKeys": self.memory_keys,
+            "seed": self.seed,
+        }
+
+
+@dataclass
+class SeededBoard:
+    """Ids the benchmarks need to build requests against the seeded board."""
+
+    board_id: str
+    list_ids: List[str]
+    milestone_ids: List[str]
+    card_ids: List[str]
+    memory_keys: List[str]
+    seconds: float
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "lists": len(self.list_ids),
+            "milestones": len(self.milestone_ids),
+            "cards": len(self.card_ids),
+            "memoryKeys": len(self.memory_keys),
+        }
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_board(module: Any, shape: BoardShape) -> SeededBoard:
+    """Bring the active board up to ``shape`` and return its ids."""
+    rng = random.Random(shape.seed)
+    started = time.perf_counter()
+    with module.STORE.writer("bench-seed") as conn:
+        c = conn.cursor()
+        c.execute("SELECT value FROM meta WHERE key='activeBoardId'")
+        board_id = c.fetchone()["value"]
+        c.execute("SELECT codename FROM boards WHERE id=?", (board_id,))
+        codename = c.fetchone()["codename"] or "BEN"
+        now = module.now_iso()
+
+        c.execute("SELECT id FROM lists WHERE boardId=? ORDER BY listOrder", (board_id,))
+        list_ids = [row["id"] for row in c.fetchall()]
+        new_lists = [
+            (module.new_id("list"), board_id, f"Synthetic list {index}", index, now, now)
+            for index in range(len(list_ids), shape.lists)
+        ]
+        c.executemany(
+            "INSERT INTO lists (id, boardId, key, title, listOrder, createdAt, updatedAt) VALUES (?, ?, '', ?, ?, ?, ?)",
+            new_lists,
+        )
+        list_ids.extend(row[0] for row in new_lists)
+
+        c.execute("SELECT id FROM milestones WHERE boardId=? ORDER BY msOrder", (board_id,))
+        milestone_ids = [row["id"] for row in c.fetchall()]
+        new_milestones = [
+            (
+                module.new_id("ms"), board_id, f"{codename}-{100 + index}", f"Synthetic milestone {index}",
+                index, module.MILESTONE_KIND_STANDARD, _sentence(rng, 12), now, now,
+            )
+            for index in range(len(milestone_ids), shape.milestones)
+        ]
+        c.executemany(
+            """
+            INSERT INTO milestones (
+                id, boardId, code, title, msOrder, kind, acceptsNewCards, writeClosedAt, archivedAt, goals,
+                createdAt, updatedAt
+            ) VALUES (?, ?, ?, ?, ?, ?, 1, '', '', ?, ?, ?)
+            """,
+            new_milestones,
+        )
+        # Synthetic cards and artifacts land on standard milestones so the
+        # preflight milestone's write-closure checks stay out of the picture.
+        target_milestones = [row[0] for row in new_milestones] or milestone_ids
+        milestone_ids.extend(row[0] for row in new_milestones)
+
+        c.execute("SELECT id FROM cards WHERE boardId=?", (board_id,))
+        card_ids = [row["id"] for row in c.fetchall()]
+        c.execute("SELECT nextIssueNumber FROM boards WHERE id=?", (board_id,))
+        next_issue = int(c.fetchone()["nextIssueNumber"] or 1)
+        c.execute("SELECT COALESCE(MAX(cardOrder), 0) AS n FROM cards WHERE boardId=?", (board_id,))
+        order_base = int(c.fetchone()["n"])
+        new_cards = []
+        for index in range(max(shape.cards - len(card_ids), 0)):
+            position = index // len(list_ids)
+            new_cards.append(
+                (
+                    module.new_id("card"), board_id, f"{codename}-{next_issue + index:05d}",
+                    f"Synthetic card {index}: {_sentence(rng, 4)}", _sentence(rng, 24), _sentence(rng, 8),
+                    target_milestones[index % len(target_milestones)], list_ids[index % len(list_ids)],
+                    rng.choice(PRIORITIES), order_base + (position + 1) * module.CARD_ORDER_GAP, now, now,
+                )
+            )
+        c.executemany(
+            """
+            INSERT INTO cards (
+                id, boardId, issueNumber, title, description, acceptance, milestoneId, listId,
+                priority, owner, targetDate, kind, cardOrder, createdAt, updatedAt
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '', '', 'task', ?, ?, ?)
+            """,
+            new_cards,
+        )
+        c.execute("UPDATE boards SET nextIssueNumber=? WHERE id=?", (next_issue + len(new_cards), board_id))
+        card_ids.extend(row[0] for row in new_cards)
+
+        c.execute("SELECT COUNT(*) AS n FROM charts WHERE boardId=?", (board_id,))
+        c.executemany(
+            "INSERT INTO charts (id, boardId, title, description, markdown, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (module.new_id("chart"), board_id, f"Synthetic chart {index}", _sentence(rng, 10), CHART_MARKDOWN, now, now)
+                for index in range(c.fetchone()["n"], shape.charts)
+            ],
+        )
+
+        slots = [(milestone_id, kind) for milestone_id in target_milestones for kind in MILESTONE_ARTIFACT_TYPES]
+        c.execute("SELECT COUNT(*) AS n FROM milestone_artifacts WHERE boardId=?", (board_id,))
+        artifact_rows = []
+        for index in range(c.fetchone()["n"], shape.artifacts):
+            milestone_id, artifact_type = slots[index % len(slots)]
+            revision = index // len(slots) + 1
+            artifact_rows.append(
+                (
+                    module.new_id("mfa"), board_id, milestone_id, artifact_type, revision,
+                    f"Synthetic {artifact_type} r{revision}", _sentence(rng, 12), _sentence(rng, 120), now, now,
+                )
+            )
+        c.executemany(
+            """
+            INSERT INTO milestone_artifacts (
+                id, boardId, milestoneId, artifactType, revision, title, summary, body, createdAt, updatedAt
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            artifact_rows,
+        )
+
+        memory_keys = [f"bench.{index}" for index in range(max(shape.memory_keys, 1))]
+        _seed_memory(module, c, rng, board_id, memory_keys, shape.memory_events)
+        conn.commit()
+    module.STORE.invalidate_snapshot()
+    return SeededBoard(
+        board_id=board_id,
+        list_ids=list_ids,
+        milestone_ids=milestone_ids,
+        card_ids=card_ids,
+        memory_keys=memory_keys,
+        seconds=round(time.perf_counter() - started, 3),
+    )
+
+
+def _seed_memory(module: Any, c: Any, rng: random.Random, board_id: str, keys: List[str], events: int) -> None:
+    """Append ``events`` memory events round-robin over ``keys`` and fold them into objects."""
+    base = time.time() - events
+
+    def stamp(offset: int) -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base + offset))
+
+    latest: Dict[str, Dict[str, Any]] = {}
+    event_rows = []
+    for index in range(events):
+        key = keys[index % len(keys)]
+        row = {
+            "memoryKey": key,
+            "value": module._json_dumps_compact({"n": index, "note": _sentence(rng, 6)}),
+            "tags": module._json_dumps_compact(["bench", f"t{index % 8}"]),
+            "sourceRef": f"bench:{index}",
+        }
+        event_id = f"mev_bench{index:08d}"
+        bucket = MEMORY_BUCKETS[index % len(MEMORY_BUCKETS)]
+        event_rows.append(
+            (
+                event_id, board_id, key, "upsert", "operator", 1, bucket, row["value"], row["tags"],
+                None, row["sourceRef"], stamp(index), module._memory_event_payload_bytes(row),
+            )
+        )
+        previous = latest.get(key)
+        latest[key] = {
+            **row,
+            "bucket": bucket,
+            "eventId": event_id,
+            "createdAt": previous["createdAt"] if previous else stamp(index),
+            "updatedAt": stamp(index),
+            "version": (previous["version"] + 1) if previous else 1,
+        }
+    c.executemany(
+        """
+        INSERT INTO memory_events (
+            id, boardId, memoryKey, eventType, sourceType, attested, bucket,
+            value, tags, ttlSeconds, sourceRef, createdAt, payloadBytes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        event_rows,
+    )
+    c.executemany(
+        """
+        INSERT INTO memory_objects (
+            id, boardId, memoryKey, bucket, value, tags, sourceType, isDeleted,
+            version, lastEventId, createdAt, updatedAt, lastTouchedAt, expiresAt, payloadBytes
+        ) VALUES (?, ?, ?, ?, ?, ?, 'operator', 0, ?, ?, ?, ?, ?, '', ?)
+        """,
+        [
+            (
+                module.new_id("memobj"), board_id, key, row["bucket"], row["value"], row["tags"], row["version"],
+                row["eventId"], row["createdAt"], row["updatedAt"], row["updatedAt"],
+                module._memory_object_payload_bytes(row),
+            )
+            for key, row in latest.items()
+        ],
+    )
+    c.executemany(
+        "INSERT OR IGNORE INTO memory_object_tags (boardId, memoryKey, tag) VALUES (?, ?, ?)",
+        [(board_id, key, tag) for key, row in latest.items() for tag in json.loads(row["tags"])],
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Seed a synthetic board and report how long it took.")
+    BoardShape.add_arguments(parser)
+    parser.add_argument("--keep", default="", help="Copy the seeded database to this path")
+    args = parser.parse_args()
+    shape = BoardShape.from_args(args)
+
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as tmp:
+        deck_dir = build_workspace(Path(tmp))
+        module = load_server(deck_dir)
+        board = seed_board(module, shape)
+        module.STORE.close()
+        if args.keep:
+            Path(args.keep).write_bytes((deck_dir / "data" / "amphion.db").read_bytes())
+    print(json.dumps({"shape": shape.to_json(), "counts": board.counts(), "seconds": board.seconds}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -65,6 +65,7 @@ def init_db(db_path: Path, project_name: str, codename: str, initial_version: st
             projectType TEXT,
             foundationPath TEXT,
             preflightLifecycleInitialized INTEGER DEFAULT 0,
+            stateVersion INTEGER DEFAULT 0,
             createdAt TEXT,
             updatedAt TEXT
         );
@@ -133,7 +134,8 @@ def init_db(db_path: Path, project_name: str, codename: str, initial_version: st
             tags TEXT,
             ttlSeconds INTEGER,
             sourceRef TEXT,
-            createdAt TEXT
+            createdAt TEXT,
+            payloadBytes INTEGER NOT NULL DEFAULT 0
         );
 
         CREATE TABLE IF NOT EXISTS memory_objects (
@@ -151,9 +153,17 @@ def init_db(db_path: Path, project_name: str, codename: str, initial_version: st
             updatedAt TEXT,
             lastTouchedAt TEXT,
             expiresAt TEXT,
+            payloadBytes INTEGER NOT NULL DEFAULT 0,
             UNIQUE(boardId, memoryKey)
         );
 
+        CREATE TABLE IF NOT EXISTS memory_object_tags (
+            boardId TEXT NOT NULL,
+            memoryKey TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (boardId, memoryKey, tag)
+        ) WITHOUT ROWID;
+
         CREATE TABLE IF NOT EXISTS milestone_artifacts (
             id TEXT PRIMARY KEY,
             boardId TEXT NOT NULL,
@@ -184,10 +194,11 @@ def init_db(db_path: Path, project_name: str, codename: str, initial_version: st
             UNIQUE(boardId, artifactType, revision)
         );
 
-        CREATE INDEX IF NOT EXISTS idx_memory_events_board_created ON memory_events(boardId, createdAt);
         CREATE INDEX IF NOT EXISTS idx_memory_events_board_key ON memory_events(boardId, memoryKey);
+        CREATE INDEX IF NOT EXISTS idx_memory_events_board_payload ON memory_events(boardId, createdAt, id, payloadBytes);
         CREATE INDEX IF NOT EXISTS idx_memory_objects_board_updated ON memory_objects(boardId, updatedAt);
         CREATE INDEX IF NOT EXISTS idx_memory_objects_board_bucket ON memory_objects(boardId, bucket);
+        CREATE INDEX IF NOT EXISTS idx_memory_object_tags_tag ON memory_object_tags(boardId, tag, memoryKey);
         CREATE INDEX IF NOT EXISTS idx_milestone_artifacts_lookup
             ON milestone_artifacts(boardId, milestoneId, artifactType, revision DESC);
         CREATE INDEX IF NOT EXISTS idx_milestone_artifacts_type_updated
@@ -204,6 +215,7 @@ def init_db(db_path: Path, project_name: str, codename: str, initial_version: st
     board_id = new_id("board", board_seed)
     c.execute("INSERT INTO meta (key, value) VALUES (?, ?)", ("activeBoardId", board_id))
     c.execute("INSERT INTO meta (key, value) VALUES (?, ?)", ("version", "1"))
+    c.execute("INSERT INTO meta (key, value) VALUES (?, ?)", ("stateVersion", "0"))
 
     now = now_iso()
     c.execute('''
@@ -9,22 +9,32 @@ pattern, description) so agents never need to call GET /api/conventions
 before performing writes.
 """
 
+import gzip
+import http.client
 import json
 import sys
+import time
 import urllib.request
-import urllib.error
 import os
 
 
+# Port read from .amphion/config.json, reused until the file's mtime changes.
+PORT_CACHE = {"path": None, "mtime": None, "port": None}
+
+
 def resolve_port():
     """Read port from .amphion/config.json. Errors if config is missing."""
     config_path = os.path.join(os.getcwd(), ".amphion", "config.json")
     try:
+        mtime = os.stat(config_path).st_mtime_ns
+        if PORT_CACHE["path"] == config_path and PORT_CACHE["mtime"] == mtime:
+            return PORT_CACHE["port"]
         with open(config_path, "r") as f:
             config = json.load(f)
             port = str(config.get("port", "")).strip()
             if not port:
                 raise ValueError("No port configured in .amphion/config.json")
+            PORT_CACHE.update(path=config_path, mtime=mtime, port=port)
             return port
     except FileNotFoundError:
         sys.stderr.write("No .amphion/config.json found. Run /amphion to set up.\n")
@@ -45,33 +55,122 @@ def resolve_version():
         return "0.0.0"
 
 
-def api_request(method, path, body=None):
+# Last ETag and body per GET URL, so repeated reads of unchanged data get a 304.
+ETAG_CACHE = {}
+ETAG_CACHE_SIZE = 64
+
+
+def read_body(resp):
+    """Read a response body, undoing gzip content-encoding."""
+    raw = resp.read()
+    if (resp.headers.get("Content-Encoding") or "").lower() == "gzip":
+        raw = gzip.decompress(raw)
+    return raw
+
+
+# One keep-alive connection to the deck for the life of the bridge.
+CONNECTION = {"port": None, "conn": None, "used": 0.0}
+# The deck drops keep-alive connections idle for 30 s (KEEPALIVE_SECONDS);
+# reopen a little before that rather than race its close.
+CONNECTION_IDLE_REOPEN = 25.0
+# Only these are resent after the deck drops a reused connection. The deck
+# also closes without a response when a handler fails, possibly after its
+# commit, so resending a write could apply it twice.
+RETRY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def close_connection():
+    conn = CONNECTION["conn"]
+    CONNECTION.update(port=None, conn=None)
+    if conn is not None:
+        conn.close()
+
+
+def send_request(port, method, path, data, headers, timeout):
+    """One request/response on the shared connection; returns (response, body).
+
+    A connection idle for close to the deck's keep-alive timeout is reopened
+    before sending. If a reused connection is still dropped without a
+    response, reads are sent once more on a fresh one; writes are not, as
+    the deck may already have applied them.
+    """
+    for attempt in (0, 1):
+        conn = CONNECTION["conn"]
+        stale = time.monotonic() - CONNECTION["used"] > CONNECTION_IDLE_REOPEN
+        if conn is None or CONNECTION["port"] != port or stale:
+            close_connection()
+            conn = http.client.HTTPConnection("127.0.0.1", int(port), timeout=timeout)
+            CONNECTION.update(port=port, conn=conn)
+        reused = conn.sock is not None
+        if reused:
+            conn.sock.settimeout(timeout)
+        else:
+            conn.timeout = timeout
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = read_body(resp)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            close_connection()
+            if reused and attempt == 0 and method in RETRY_METHODS:
+                continue
+            raise
+        except Exception:
+            close_connection()
+            raise
+        CONNECTION["used"] = time.monotonic()
+        if resp.will_close:
+            close_connection()
+        return resp, raw
+
+
+def api_request(method, path, body=None, timeout=5):
     """Make HTTP request to Command Deck API."""
-    port = resolve_port()
+    try:
+        port = resolve_port()
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
     url = f"http://127.0.0.1:{port}{path}"
     data = json.dumps(body).encode("utf-8") if body else None
-    req = urllib.request.Request(
-        url,
-        data=data,
-        method=method,
-        headers={"Content-Type": "application/json"} if data else {},
-    )
+    headers = {"Accept-Encoding": "gzip"}
+    if data:
+        headers["Content-Type"] = "application/json"
+    cached = ETAG_CACHE.get(url) if method == "GET" else None
+    if cached:
+        headers["If-None-Match"] = cached[0]
     try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        body_text = ""
-        try:
-            body_text = e.read().decode("utf-8", errors="replace")
-        except Exception:
-            pass
-        return {"ok": False, "error": f"HTTP {e.code}: {body_text or e.reason}"}
-    except urllib.error.URLError as e:
+        resp, raw = send_request(port, method, path, data, headers, timeout)
+    except (OSError, http.client.HTTPException) as e:
         return {"ok": False, "error": f"Command Deck unreachable: {e}"}
-    except Exception as e:
+    if resp.status == 304 and cached:
+        return json.loads(cached[1].decode("utf-8"))
+    if resp.status >= 300:
+        body_text = raw.decode("utf-8", errors="replace")
+        return {"ok": False, "error": f"HTTP {resp.status}: {body_text or resp.reason}"}
+    etag = resp.headers.get("ETag")
+    if method == "GET" and etag:
+        ETAG_CACHE.pop(url, None)
+        ETAG_CACHE[url] = (etag, raw)
+        while len(ETAG_CACHE) > ETAG_CACHE_SIZE:
+            ETAG_CACHE.pop(next(iter(ETAG_CACHE)))
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except ValueError as e:
         return {"ok": False, "error": str(e)}
 
 
+def api_write(method, path, body=None):
+    """Mutating call: the deck replies with the touched entity plus a version.
+
+    Older Command Deck runtimes always attach the full board state; drop it so
+    tool results stay small. Use board_state when the whole board is needed.
+    """
+    result = api_request(method, path, body)
+    if isinstance(result, dict):
+        result.pop("state", None)
+    return result
+
+
 # -- Tool definitions --
 # Schemas embed enum, maxLength, pattern, and description constraints
 # so agents can write payloads without calling GET /api/conventions first.
@@ -98,7 +197,11 @@ TOOLS = [
             "properties": {
                 "q": {
                     "type": "string",
-                    "description": "Free-text search query",
+                    "description": (
+                        "Free-text search query. Case-insensitive substring match over card "
+                        "issue numbers, titles, descriptions and acceptance, milestone codes, "
+                        "titles and meta contracts, and chart titles; best matches first"
+                    ),
                 },
                 "milestoneId": {
                     "type": "string",
@@ -139,6 +242,30 @@ TOOLS = [
             "required": ["intent"],
         },
     },
+    {
+        "name": "board_changes",
+        "description": (
+            "List board and memory changes (card moved, milestone archived, memory upserted, ...) "
+            "since a cursor, each with the new state version and affected entity IDs. "
+            "Pass the returned cursor back as `since` to follow along without re-reading board_state; "
+            "if `resync` is true, events were missed and board_state should be re-read."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "string",
+                    "description": "Cursor from a previous board_changes call. Omit to start from now.",
+                },
+                "waitSeconds": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": 30,
+                    "description": "Wait up to this many seconds for the next change (default 0)",
+                },
+            },
+        },
+    },
     {
         "name": "server_health",
         "description": "Check Command Deck server health and runtime status.",
@@ -333,7 +460,7 @@ TOOLS = [
     },
     {
         "name": "move_card",
-        "description": "Move a card to a different list (shorthand for update_card with only listId).",
+        "description": "Move a card to a different list, at the end or next to a given card.",
         "inputSchema": {
             "type": "object",
             "properties": {
@@ -345,10 +472,40 @@ TOOLS = [
                     "type": "string",
                     "description": "Target list ID to move the card to",
                 },
+                "afterCardId": {
+                    "type": "string",
+                    "description": "Optional: place the card directly after this card in the target list",
+                },
+                "beforeCardId": {
+                    "type": "string",
+                    "description": "Optional: place the card directly before this card in the target list",
+                },
             },
             "required": ["cardId", "listId"],
         },
     },
+    {
+        "name": "reorder_card",
+        "description": "Reposition a card within its list, directly after and/or before other cards in that list.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "cardId": {
+                    "type": "string",
+                    "description": "Card ID to reposition",
+                },
+                "afterCardId": {
+                    "type": "string",
+                    "description": "Place the card directly after this card",
+                },
+                "beforeCardId": {
+                    "type": "string",
+                    "description": "Place the card directly before this card",
+                },
+            },
+            "required": ["cardId"],
+        },
+    },
     {
         "name": "delete_card",
         "description": "Permanently delete a card from the board.",
@@ -363,6 +520,50 @@ TOOLS = [
             "required": ["cardId"],
         },
     },
+    {
+        "name": "batch_cards",
+        "description": (
+            "Create, update, move, or delete many cards in one all-or-nothing call (max 500 "
+            "operations). Issue numbers are assigned in operation order. If any operation is "
+            "rejected, nothing is written and the error names its index."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "boardId": {
+                    "type": "string",
+                    "description": "Default board for create operations that omit boardId",
+                },
+                "operations": {
+                    "type": "array",
+                    "maxItems": 500,
+                    "description": (
+                        "Operations in order. create takes the create_card fields; update takes cardId plus "
+                        "update_card fields; move takes cardId and listId; delete takes cardId."
+                    ),
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "op": {"type": "string", "enum": ["create", "update", "move", "delete"]},
+                            "cardId": {"type": "string", "description": "Target card (update, move, delete)"},
+                            "boardId": {"type": "string"},
+                            "milestoneId": {"type": "string"},
+                            "listId": {"type": "string"},
+                            "title": {"type": "string"},
+                            "description": {"type": "string"},
+                            "acceptance": {"type": "string"},
+                            "priority": {"type": "string", "enum": ["P0", "P1", "P2", "P3"]},
+                            "kind": {"type": "string", "enum": ["task", "bug"]},
+                            "owner": {"type": "string"},
+                            "targetDate": {"type": "string"},
+                        },
+                        "required": ["op"],
+                    },
+                },
+            },
+            "required": ["operations"],
+        },
+    },
     # ── Chart operations ─────────────────────────────────────────────
     {
         "name": "create_chart",
@@ -579,6 +780,44 @@ TOOLS = [
             "required": ["memoryKey", "value", "sourceType"],
         },
     },
+    {
+        "name": "write_memory_batch",
+        "description": (
+            "Write many memory events in one call (max 1000). Events are applied in order in a "
+            "single transaction; each gets its own result, and invalid events are rejected "
+            "without blocking the rest. Prefer this over repeated write_memory calls."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "maxItems": 1000,
+                    "description": "Memory events, same fields as write_memory (eventType defaults to 'upsert')",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "memoryKey": {"type": "string"},
+                            "value": {"type": "object"},
+                            "sourceType": {"type": "string", "enum": ["user", "operator", "verified-system"]},
+                            "eventType": {"type": "string", "enum": ["upsert", "delete", "touch"]},
+                            "bucket": {"type": "string", "enum": ["ct", "dec", "trb", "lrn", "nx", "ref", "misc"]},
+                            "tags": {"type": "array", "items": {"type": "string"}},
+                            "ttlSeconds": {"type": "integer", "maximum": 31536000},
+                            "sourceRef": {"type": "string"},
+                            "boardId": {"type": "string", "description": "Overrides the batch boardId"},
+                        },
+                        "required": ["memoryKey", "sourceType"],
+                    },
+                },
+                "boardId": {
+                    "type": "string",
+                    "description": "Optional board scope for every event in the batch",
+                },
+            },
+            "required": ["events"],
+        },
+    },
     {
         "name": "query_memory",
         "description": "Query memory events by key, source type, bucket, or tag.",
@@ -607,6 +846,10 @@ TOOLS = [
                     "type": "integer",
                     "description": "Max results to return",
                 },
+                "cursor": {
+                    "type": "string",
+                    "description": "nextCursor from a previous query_memory result, to fetch the next page",
+                },
                 "boardId": {
                     "type": "string",
                     "description": "Scope query to a specific board",
@@ -657,78 +900,94 @@ def handle_tool_call(name, arguments):
         intent = arguments.get("intent", "")
         return api_request("GET", f"/api/conventions?intent={intent}")
 
+    elif name == "board_changes":
+        wait = max(0, min(30, int(arguments.get("waitSeconds") or 0)))
+        params = ["format=json", f"wait={wait}"]
+        if arguments.get("since"):
+            params.append(f"since={urllib.request.quote(str(arguments['since']))}")
+        return api_request("GET", f"/api/events?{'&'.join(params)}", timeout=wait + 5)
+
     elif name == "server_health":
         return api_request("GET", "/api/health")
 
     # ── Milestone operations ─────────────────────────────────────
     elif name == "create_milestone":
-        return api_request("POST", "/api/milestones", arguments)
+        return api_write("POST", "/api/milestones", arguments)
 
     elif name == "update_milestone":
         ms_id = arguments.pop("milestoneId", "")
-        return api_request("PATCH", f"/api/milestones/{ms_id}", arguments)
+        return api_write("PATCH", f"/api/milestones/{ms_id}", arguments)
 
     elif name == "delete_milestone":
         ms_id = arguments.get("milestoneId", "")
-        return api_request("DELETE", f"/api/milestones/{ms_id}")
+        return api_write("DELETE", f"/api/milestones/{ms_id}")
 
     elif name == "restore_milestone":
         ms_id = arguments.get("milestoneId", "")
-        return api_request("POST", f"/api/milestones/{ms_id}/restore")
+        return api_write("POST", f"/api/milestones/{ms_id}/restore")
 
     # ── Card operations ──────────────────────────────────────────
     elif name == "create_card":
-        return api_request("POST", "/api/cards", arguments)
+        return api_write("POST", "/api/cards", arguments)
 
     elif name == "update_card":
         card_id = arguments.pop("cardId", "")
-        return api_request("PATCH", f"/api/cards/{card_id}", arguments)
+        return api_write("PATCH", f"/api/cards/{card_id}", arguments)
 
     elif name == "move_card":
-        card_id = arguments.get("cardId", "")
-        list_id = arguments.get("listId", "")
-        return api_request("POST", f"/api/cards/{card_id}/move", {"listId": list_id})
+        card_id = arguments.pop("cardId", "")
+        return api_write("POST", f"/api/cards/{card_id}/move", arguments)
+
+    elif name == "reorder_card":
+        card_id = arguments.pop("cardId", "")
+        return api_write("POST", f"/api/cards/{card_id}/reorder", arguments)
 
     elif name == "delete_card":
         card_id = arguments.get("cardId", "")
-        return api_request("DELETE", f"/api/cards/{card_id}")
+        return api_write("DELETE", f"/api/cards/{card_id}")
+
+    elif name == "batch_cards":
+        return api_write("POST", "/api/cards:batch", arguments)
 
     # ── Chart operations ─────────────────────────────────────────
     elif name == "create_chart":
-        return api_request("POST", "/api/charts", arguments)
+        return api_write("POST", "/api/charts", arguments)
 
     elif name == "update_chart":
         chart_id = arguments.pop("chartId", "")
-        return api_request("PATCH", f"/api/charts/{chart_id}", arguments)
+        return api_write("PATCH", f"/api/charts/{chart_id}", arguments)
 
     elif name == "delete_chart":
         chart_id = arguments.get("chartId", "")
-        return api_request("DELETE", f"/api/charts/{chart_id}")
+        return api_write("DELETE", f"/api/charts/{chart_id}")
 
     # ── Artifact operations ──────────────────────────────────────
     elif name == "write_findings":
         ms_id = arguments.pop("milestoneId", "")
         arguments["artifactType"] = "findings"
-        return api_request("POST", f"/api/milestones/{ms_id}/artifacts", arguments)
+        return api_write("POST", f"/api/milestones/{ms_id}/artifacts", arguments)
 
     elif name == "write_outcomes":
         ms_id = arguments.pop("milestoneId", "")
         arguments["artifactType"] = "outcomes"
-        return api_request("POST", f"/api/milestones/{ms_id}/artifacts", arguments)
+        return api_write("POST", f"/api/milestones/{ms_id}/artifacts", arguments)
 
     elif name == "write_board_artifact":
         board_id = arguments.pop("boardId", "")
-        return api_request("POST", f"/api/boards/{board_id}/artifacts", arguments)
+        return api_write("POST", f"/api/boards/{board_id}/artifacts", arguments)
 
     # ── Memory operations ────────────────────────────────────────
     elif name == "write_memory":
         if "eventType" not in arguments:
             arguments["eventType"] = "upsert"
-        return api_request("POST", "/api/memory/events", arguments)
+        return api_write("POST", "/api/memory/events", arguments)
+
+    elif name == "write_memory_batch":
+        return api_write("POST", "/api/memory/events:batch", arguments)
 
     elif name == "query_memory":
         params = []
-        for key in ("key", "sourceType", "bucket", "tag", "limit", "boardId"):
+        for key in ("key", "sourceType", "bucket", "tag", "limit", "cursor", "boardId"):
             if key in arguments and arguments[key] is not None:
                 val = arguments[key]
                 if key == "key":
@@ -756,7 +1015,7 @@ def handle_tool_call(name, arguments):
 def send_response(id, result):
     """Send JSON-RPC response."""
     msg = {"jsonrpc": "2.0", "id": id, "result": result}
-    content = json.dumps(msg)
+    content = json.dumps(msg, separators=(",", ":"))
     sys.stdout.write(f"Content-Length: {len(content)}\r\n\r\n{content}")
     sys.stdout.flush()
 
@@ -764,7 +1023,7 @@ def send_response(id, result):
 def send_error(id, code, message):
     """Send JSON-RPC error."""
     msg = {"jsonrpc": "2.0", "id": id, "error": {"code": code, "message": message}}
-    content = json.dumps(msg)
+    content = json.dumps(msg, separators=(",", ":"))
     sys.stdout.write(f"Content-Length: {len(content)}\r\n\r\n{content}")
     sys.stdout.flush()
 
@@ -821,8 +1080,9 @@ def main():
                 tool_name = params.get("name", "")
                 arguments = params.get("arguments", {})
                 result = handle_tool_call(tool_name, arguments)
-                # Truncate large state responses to avoid context bloat
-                result_text = json.dumps(result, indent=2)
+                # Compact, unescaped text so the truncation budget goes to content.
+                # The envelope stays ASCII, which keeps Content-Length a byte count.
+                result_text = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
                 if len(result_text) > 30000:
                     result_text = result_text[:30000] + "\n... (truncated)"
                 send_response(id, {